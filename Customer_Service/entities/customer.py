@@ -1,10 +1,103 @@
 import sqlite3
 import json
+import sys
+import threading
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from typing import List, Dict, Optional
 
+import msgspec
 from pydantic import BaseModel, ConfigDict, Field
 
 
+class _ConnectionPool:
+    """
+    A small thread-safe pool of SQLite connections reused across lookups.
+    """
+
+    def __init__(self, database: str, size: int = 5):
+        self._database = database
+        self._size = size
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._database, check_same_thread=False)
+        # The database is read-mostly: memory-map it and keep a large page cache so
+        # rows are served from mapped pages instead of read() syscalls.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def checkout(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._connections:
+                return self._connections.pop()
+        return self._connect()
+
+    def checkin(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if len(self._connections) < self._size:
+                self._connections.append(conn)
+                return
+        conn.close()
+
+
+_pool = _ConnectionPool('customer_service.db')
+
+# SQL is kept as module-level constants so the identical text hits each pooled
+# connection's prepared-statement cache on every call.
+_SQL_CUSTOMER_COLUMNS = """
+                        SELECT account_number, customer_id, customer_first_name, customer_last_name, email,
+                               phone_number, customer_start_date, years_as_customer,
+                               billing_address_street, billing_address_city, billing_address_state,
+                               billing_address_zip, loyalty_points, preferred_store,
+                               comm_pref_email, comm_pref_sms, comm_pref_push,
+                               garden_type, garden_size, garden_sun_exposure, garden_soil_type, garden_interests
+                        FROM customers
+                        """
+
+_SQL_CUSTOMER = _SQL_CUSTOMER_COLUMNS + "WHERE customer_id = ?"
+
+# Purchase items are denormalized into purchases.items_json, so no join is needed
+_SQL_PURCHASES = "SELECT date, total_amount, items_json FROM purchases WHERE customer_id = ? ORDER BY purchase_id"
+
+# Batch variants; {placeholders} is filled with one '?' per requested customer ID
+_SQL_CUSTOMERS_IN = _SQL_CUSTOMER_COLUMNS + "WHERE customer_id IN ({placeholders})"
+
+_SQL_PURCHASES_IN = """
+                    SELECT customer_id, date, total_amount, items_json
+                    FROM purchases
+                    WHERE customer_id IN ({placeholders})
+                    ORDER BY customer_id, purchase_id
+                    """
+
+# Interned field names per model, in declaration order, used by _fast_construct
+_MODEL_FIELDS: Dict[type, tuple] = {}
+
+
+def _fast_construct(model: type, values: tuple):
+    """
+    Builds a model instance from values given in field order, bypassing validation.
+
+    Lighter than model_construct for the per-row hot path: no defaults, aliases or
+    extras are processed, so every field must be supplied.
+    """
+    fields = _MODEL_FIELDS.get(model)
+    if fields is None:
+        fields = _MODEL_FIELDS[model] = tuple(sys.intern(name) for name in model.model_fields)
+    obj = model.__new__(model)
+    object.__setattr__(obj, '__dict__', dict(zip(fields, values)))
+    object.__setattr__(obj, '__pydantic_fields_set__', set(fields))
+    object.__setattr__(obj, '__pydantic_extra__', None)
+    object.__setattr__(obj, '__pydantic_private__', None)
+    return obj
+
+
 class Address(BaseModel):
     """
     Represents the address of a customer.
@@ -78,95 +171,263 @@ class Customer(BaseModel):
     garden_profile: Optional[GardenProfile] = None
     model_config = ConfigDict(from_attributes=True)
 
-    @staticmethod
-    def get_customer(customer_id: str):
+    @classmethod
+    def get_customer(cls, customer_id: str) -> Optional['Customer']:
         """
         Fetches customer data from the SQLite database and returns a Customer object.
+
+        Found customers are cached per customer ID and the same instance is returned on
+        repeat lookups, so callers must not mutate it. Misses are not cached. Code that
+        updates existing customer or purchase rows must call Customer.invalidate() afterwards.
         """
+        try:
+            return _load_customer(customer_id)
+        except _NotFound:
+            print(f"Customer with ID {customer_id} not found.")
+            return None
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """
+        Drops all cached customers so the next get_customer call re-reads the database.
+        """
+        _load_customer.cache_clear()
+
+    @classmethod
+    def get_customers(cls, customer_ids: List[str]) -> Dict[str, 'Customer']:
+        """
+        Fetches several customers at once and returns them keyed by customer ID.
+
+        IDs that are not found are omitted. This always reads the database and neither
+        uses nor fills the get_customer cache. See get_customer_rows for the query plan.
+        """
+        return {customer_id: row.to_pydantic() for customer_id, row in cls.get_customer_rows(customer_ids).items()}
+
+    @staticmethod
+    def get_customer_rows(customer_ids: List[str]) -> Dict[str, 'CustomerRow']:
+        """
+        Fetches several customers at once as lightweight CustomerRow structs.
+
+        Issues one query for the customer rows and one for all of their purchases,
+        regardless of how many IDs are requested. Like get_customers, this bypasses the
+        get_customer cache. Use this for high-volume reads and call to_pydantic() only
+        where a Customer model is actually needed.
+
+        As with get_customer, a database error is printed and an empty result returned.
+        Rows never fail individually, because purchase items carry their own product names.
+        """
+        if not customer_ids:
+            return {}
+
         conn = None
         try:
-            conn = sqlite3.connect('customer_service.db')
-            conn.row_factory = sqlite3.Row  # Allows accessing columns by name
+            conn = _pool.checkout()
             cursor = conn.cursor()
+            placeholders = ','.join('?' * len(customer_ids))
+
+            # 1. Fetch every purchase for those customers, grouped by customer ID. Rows are
+            # streamed from the cursor rather than materialized with fetchall().
+            cursor.execute(_SQL_PURCHASES_IN.format(placeholders=placeholders), customer_ids)
+            purchases_by_customer = {
+                customer_id: [_purchase_from_row(*purchase_row[1:]) for purchase_row in purchase_rows]
+                for customer_id, purchase_rows in groupby(cursor, key=itemgetter(0))
+            }
 
-            # 1. Fetch main customer details from the flattened table
-            cursor.execute("SELECT * FROM customers WHERE customer_id = ?", (customer_id,))
-            customer_row = cursor.fetchone()
-
-            if customer_row is None:
-                print(f"Customer with ID {customer_id} not found.")
-                return None
-
-            # 2. Reconstruct nested Pydantic models from flattened columns
-            billing_address = Address(
-                street=customer_row['billing_address_street'],
-                city=customer_row['billing_address_city'],
-                state=customer_row['billing_address_state'],
-                zip=customer_row['billing_address_zip']
-            )
-
-            comm_prefs = CommunicationPreferences(
-                email=bool(customer_row['comm_pref_email']),
-                sms=bool(customer_row['comm_pref_sms']),
-                push_notifications=bool(customer_row['comm_pref_push'])
-            )
-
-            garden_profile = None
-            if customer_row['garden_type']:
-                garden_profile = GardenProfile(
-                    type=customer_row['garden_type'],
-                    size=customer_row['garden_size'],
-                    sun_exposure=customer_row['garden_sun_exposure'],
-                    soil_type=customer_row['garden_soil_type'],
-                    interests=json.loads(customer_row['garden_interests'])
-                )
-
-            # 3. Fetch purchase history from related tables
-            purchase_history = []
-            cursor.execute("SELECT * FROM purchases WHERE customer_id = ?", (customer_id,))
-            purchase_rows = cursor.fetchall()
-
-            for purchase_row in purchase_rows:
-                cursor.execute("""
-                               SELECT pi.product_id, pi.quantity, p.name
-                               FROM purchase_items pi
-                                        JOIN products p ON pi.product_id = p.product_id
-                               WHERE pi.purchase_id = ?
-                               """, (purchase_row['purchase_id'],))
-                item_rows = cursor.fetchall()
-
-                items = [Product(product_id=item['product_id'], name=item['name'], quantity=item['quantity']) for item
-                         in item_rows]
-
-                purchase = Purchase(
-                    date=purchase_row['date'],
-                    items=items,
-                    total_amount=purchase_row['total_amount']
-                )
-                purchase_history.append(purchase)
-
-            # 4. Create the final Customer object
-            customer_data = dict(customer_row)
-            customer_data['billing_address'] = billing_address
-            customer_data['purchase_history'] = purchase_history
-            customer_data['communication_preferences'] = comm_prefs
-            customer_data['garden_profile'] = garden_profile
-
-            return cls(**customer_data)
+            # 2. Fetch the requested customer rows and create a CustomerRow per row
+            cursor.execute(_SQL_CUSTOMERS_IN.format(placeholders=placeholders), customer_ids)
+            return {
+                customer_row[1]: _customer_from_row(customer_row, purchases_by_customer.get(customer_row[1], []))
+                for customer_row in cursor
+            }
 
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-            return None
+            return {}
         finally:
             if conn:
-                conn.close()
+                _pool.checkin(conn)
+
+
+# Read-side mirrors of the models above. Rows from the database are decoded into
+# these msgspec structs, which are much cheaper to build than Pydantic models, and
+# converted with to_pydantic() at the boundary where a validated model is expected.
+
+class AddressRow(msgspec.Struct, frozen=True, gc=False):
+    street: str
+    city: str
+    state: str
+    zip: str
+
+    def to_pydantic(self) -> Address:
+        return Address.model_construct(street=self.street, city=self.city, state=self.state, zip=self.zip)
+
+
+class ProductRow(msgspec.Struct, frozen=True, gc=False):
+    product_id: str
+    name: str
+    quantity: int
+
+    def to_pydantic(self) -> Product:
+        return _fast_construct(Product, (self.product_id, self.name, self.quantity))
+
+
+class PurchaseRow(msgspec.Struct, frozen=True, gc=False):
+    date: str
+    items: List[ProductRow]
+    total_amount: float
+
+    def to_pydantic(self) -> Purchase:
+        return _fast_construct(Purchase, (self.date, [item.to_pydantic() for item in self.items], self.total_amount))
+
+
+class CommunicationPreferencesRow(msgspec.Struct, frozen=True, gc=False):
+    email: bool = True
+    sms: bool = True
+    push_notifications: bool = True
+
+    def to_pydantic(self) -> CommunicationPreferences:
+        return CommunicationPreferences.model_construct(email=self.email, sms=self.sms,
+                                                        push_notifications=self.push_notifications)
+
+
+class GardenProfileRow(msgspec.Struct, frozen=True, gc=False):
+    type: str
+    size: str
+    sun_exposure: str
+    soil_type: str
+    interests_raw: str  # Comma-separated database value, only split when interests is read
+
+    @property
+    def interests(self) -> List[str]:
+        return self.interests_raw.split(',') if self.interests_raw else []
+
+    def to_pydantic(self) -> GardenProfile:
+        return GardenProfile.model_construct(type=self.type, size=self.size, sun_exposure=self.sun_exposure,
+                                             soil_type=self.soil_type, interests=self.interests)
+
+
+class CustomerRow(msgspec.Struct, frozen=True, gc=False):
+    account_number: str
+    customer_id: str
+    customer_first_name: str
+    customer_last_name: str
+    email: str
+    phone_number: Optional[str]
+    customer_start_date: str
+    years_as_customer: int
+    billing_address: AddressRow
+    purchase_history: List[PurchaseRow]
+    loyalty_points: int
+    preferred_store: str
+    communication_preferences: CommunicationPreferencesRow
+    garden_profile: Optional[GardenProfileRow] = None
+
+    def to_pydantic(self) -> Customer:
+        """
+        Converts this row into a Customer model without re-validating it.
+        """
+        data = msgspec.structs.asdict(self)
+        data['billing_address'] = self.billing_address.to_pydantic()
+        data['purchase_history'] = [purchase.to_pydantic() for purchase in self.purchase_history]
+        data['communication_preferences'] = self.communication_preferences.to_pydantic()
+        if self.garden_profile is not None:
+            data['garden_profile'] = self.garden_profile.to_pydantic()
+        return Customer.model_construct(**data)
+
+
+def _customer_from_row(customer_row, purchase_history: List[PurchaseRow]) -> CustomerRow:
+    """
+    Reconstructs a CustomerRow and its nested structs from a flattened customers row.
+    """
+    (account_number, customer_id, first_name, last_name, email,
+     phone_number, start_date, years_as_customer,
+     street, city, state, zip_code,
+     loyalty_points, preferred_store, pref_email, pref_sms, pref_push,
+     garden_type, garden_size, sun_exposure, soil_type, garden_interests) = customer_row
+
+    garden_profile = None
+    if garden_type:
+        garden_profile = GardenProfileRow(
+            type=garden_type,
+            size=garden_size,
+            sun_exposure=sun_exposure,
+            soil_type=soil_type,
+            interests_raw=garden_interests or ''
+        )
+
+    return CustomerRow(
+        account_number=account_number,
+        customer_id=customer_id,
+        customer_first_name=first_name,
+        customer_last_name=last_name,
+        email=email,
+        phone_number=phone_number,
+        customer_start_date=start_date,
+        years_as_customer=years_as_customer,
+        billing_address=AddressRow(street=street, city=city, state=state, zip=zip_code),
+        purchase_history=purchase_history,
+        # Struct defaults don't apply to NULL columns, so fill them in explicitly
+        loyalty_points=loyalty_points if loyalty_points is not None else 0,
+        preferred_store=preferred_store,
+        communication_preferences=CommunicationPreferencesRow(
+            email=bool(pref_email),
+            sms=bool(pref_sms),
+            push_notifications=bool(pref_push)
+        ),
+        garden_profile=garden_profile
+    )
+
+
+def _purchase_from_row(date: str, total_amount: float, items_json: str) -> PurchaseRow:
+    """
+    Builds a PurchaseRow from a purchases row and its denormalized items.
+    """
+    items = [ProductRow(item['product_id'], item['name'], item['quantity'])
+             for item in json.loads(items_json)]
+    return PurchaseRow(date, items, total_amount)
+
+
+class _NotFound(Exception):
+    """
+    Raised by _load_customer for unknown IDs; lru_cache does not cache exceptions.
+    """
+
+
+@lru_cache(maxsize=1024)
+def _load_customer(customer_id: str) -> Customer:
+    """
+    Reads a single customer and their purchase history from the database.
+
+    Unknown IDs and database errors are raised rather than returned so that they are
+    not cached.
+    """
+    conn = _pool.checkout()
+    try:
+        cursor = conn.cursor()
+
+        # 1. Fetch main customer details from the flattened table
+        cursor.execute(_SQL_CUSTOMER, (customer_id,))
+        customer_row = cursor.fetchone()
+
+        if customer_row is None:
+            raise _NotFound(customer_id)
+
+        # 2. Fetch purchase history; items are stored as JSON on each purchase row
+        cursor.execute(_SQL_PURCHASES, (customer_id,))
+        purchase_history = [_purchase_from_row(*purchase_row) for purchase_row in cursor]
+
+        # 3. Create the final Customer object
+        return _customer_from_row(customer_row, purchase_history).to_pydantic()
+    finally:
+        _pool.checkin(conn)
 
 
 # Example of how to use the new method
 if __name__ == '__main__':
     # Make sure to run your setup_database.py script first to create the db file
-    db_file = "customer_service.db"
-
     # Assuming there's a customer with ID 'CUST001' in your db
     fetched_customer = Customer.get_customer("CUST001")
 